@@ -0,0 +1,163 @@
+# app/anomalies.py
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# ------------------------
+# Configuration
+# ------------------------
+DAYS_PER_YEAR = 365
+FEB_29 = 59  # zero-based day of year in leap years
+
+@dataclass(frozen=True)
+class Baseline:
+    """What each day's temperature is compared against.
+
+    kind: "year-month" (the month in the same year), "month" (the month across
+    all years), "day-of-year" (the calendar day across all years) or "rolling"
+    (the calendar day across the ``window_years`` years up to and including the
+    day's year).
+    smooth_days: width of the circular window that smooths day-of-year statistics.
+    min_years: years with data a rolling window needs; earlier z-scores are NaN.
+    """
+    kind: str
+    smooth_days: int = 31
+    window_years: int = 30
+    min_years: int = 10
+
+BASELINES = {
+    "year": Baseline("year-month"),
+    "climatology": Baseline("month"),
+    "day-of-year": Baseline("day-of-year"),
+    "rolling-30y": Baseline("rolling"),
+}
+
+# ------------------------
+# Array helpers
+# ------------------------
+def circular_window_sum(values, width):
+    """Sum over a centered window along the last axis, wrapping around the year.
+
+    An even ``width`` takes one more day before the center than after it.
+    """
+    before = width // 2
+    after = width - 1 - before
+    n = values.shape[-1]
+    padded = np.concatenate([values[..., n - before:], values, values[..., :after]], axis=-1)
+    csum = np.cumsum(padded, axis=-1)
+    csum = np.concatenate([np.zeros(values.shape[:-1] + (1,)), csum], axis=-1)
+    return csum[..., width:] - csum[..., :-width]
+
+def trailing_window_sum(values, width):
+    """Sum over the ``width`` rows ending at each row along the first axis"""
+    csum = np.concatenate([np.zeros((1,) + values.shape[1:]), np.cumsum(values, axis=0)])
+    rows = np.arange(len(values))
+    return csum[rows + 1] - csum[np.maximum(rows + 1 - width, 0)]
+
+def mean_and_std(count, total, squares):
+    """Mean and sample standard deviation from counts, sums and sums of squares"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / count
+        std = np.sqrt(np.where(count > 1, (squares - total * mean) / (count - 1), np.nan))
+    return mean, std
+
+# ------------------------
+# Engine
+# ------------------------
+class AnomalyEngine:
+    """Baseline statistics and z-score anomalies for a daily temperature series.
+
+    Every baseline is built from per-group counts and moments gathered with
+    ``np.bincount`` and windowed with cumulative sums, so each one costs O(n).
+    Results are cached per baseline definition; build one engine per data version.
+    """
+
+    def __init__(self, df, column='tavg'):
+        self.index = df.index
+        values = df[column].to_numpy(dtype=float)
+        self.valid = ~np.isnan(values)
+        # Moments are taken around the overall mean to avoid cancellation
+        self.center = float(np.nanmean(values))
+        self.centered = np.where(self.valid, values - self.center, 0.0)
+        self.weights = self.valid.astype(float)
+
+        time = df['time']
+        self.years = time.dt.year.to_numpy()
+        self.first_year = int(self.years.min())
+        self.year_idx = self.years - self.first_year
+        self.n_years = int(self.year_idx.max()) + 1
+        self.months = time.dt.month.to_numpy() - 1
+        # Feb 29 shares Feb 28's statistics so every year has 365 calendar days
+        doy = time.dt.dayofyear.to_numpy() - 1
+        self.doy = np.where(time.dt.is_leap_year.to_numpy() & (doy >= FEB_29), doy - 1, doy)
+        self._cache = {}
+
+    def _moments(self, keys, size):
+        return (np.bincount(keys, self.weights, size),
+                np.bincount(keys, self.centered, size),
+                np.bincount(keys, self.centered ** 2, size))
+
+    def _keyed_moments(self, baseline):
+        """Per-group moments and each row's group key for a baseline"""
+        if baseline.kind == "year-month":
+            keys = self.year_idx * 12 + self.months
+            return self._moments(keys, self.n_years * 12), keys
+        if baseline.kind == "month":
+            return self._moments(self.months, 12), self.months
+
+        if baseline.kind == "day-of-year":
+            moments = self._moments(self.doy, DAYS_PER_YEAR)
+            keys = self.doy
+        elif baseline.kind == "rolling":
+            size = self.n_years * DAYS_PER_YEAR
+            keys = self.year_idx * DAYS_PER_YEAR + self.doy
+            moments = [trailing_window_sum(m.reshape(self.n_years, DAYS_PER_YEAR), baseline.window_years)
+                       for m in self._moments(keys, size)]
+            # Windows holding too few years of data give no baseline at all
+            has_data = np.bincount(self.year_idx, self.valid, self.n_years) > 0
+            enough = trailing_window_sum(has_data.astype(float), baseline.window_years) >= baseline.min_years
+            moments = [m * enough[:, None] for m in moments]
+        else:
+            raise ValueError(f"Unknown baseline kind: {baseline.kind}")
+        smoothed = [circular_window_sum(m, baseline.smooth_days).ravel() for m in moments]
+        return smoothed, keys
+
+    def _resolve(self, baseline):
+        if isinstance(baseline, str):
+            if baseline not in BASELINES:
+                raise ValueError(f"Unknown z-score baseline: {baseline}")
+            return BASELINES[baseline]
+        return baseline
+
+    def zscores(self, baseline="climatology"):
+        """Z-score of each day against ``baseline``, aligned with the source frame"""
+        baseline = self._resolve(baseline)
+        if baseline not in self._cache:
+            moments, keys = self._keyed_moments(baseline)
+            mean, std = mean_and_std(*moments)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                z = np.where(self.valid, (self.centered - mean[keys]) / std[keys], np.nan)
+            self._cache[baseline] = pd.Series(z, index=self.index)
+        return self._cache[baseline]
+
+    def yearly_spikes(self, baseline="climatology", threshold=2):
+        """Hot and cold spike days per year, where the z-score exceeds ``threshold``.
+
+        Years without any z-score (no data, or no baseline yet) are left out.
+        """
+        z = self.zscores(baseline).to_numpy()
+        scored = ~np.isnan(z)
+        counts = pd.DataFrame({
+            'hot-spike': np.bincount(self.year_idx, z > threshold, self.n_years),
+            'cold-spike': np.bincount(self.year_idx, z < -threshold, self.n_years),
+        }, index=pd.RangeIndex(self.first_year, self.first_year + self.n_years, name='year'))
+        return counts[np.bincount(self.year_idx, scored, self.n_years) > 0].astype(int)
+
+    def day_of_year_climatology(self, smooth_days=31):
+        """Smoothed mean and standard deviation for each calendar day"""
+        baseline = Baseline("day-of-year", smooth_days=smooth_days)
+        moments, _ = self._keyed_moments(baseline)
+        mean, std = mean_and_std(*moments)
+        return pd.DataFrame({"mean": mean + self.center, "std": std},
+                            index=pd.RangeIndex(1, DAYS_PER_YEAR + 1, name='day_of_year'))
@@ -0,0 +1,267 @@
+# app/api.py
+import argparse
+import asyncio
+import datetime
+
+from aiohttp import web
+
+import climate
+from anomalies import AnomalyEngine
+from ranges import DateRangeStats
+
+# ------------------------
+# Configuration
+# ------------------------
+DEFAULT_HOST = "0.0.0.0"
+DEFAULT_PORT = 8080
+MAX_BATCH_DATES = 20000
+POLL_SECONDS = 5
+
+# ------------------------
+# Helpers
+# ------------------------
+def current_state(request):
+    # Handlers read the state once, so a reload mid-request never mixes versions
+    return request.app["store"]["state"]
+
+def bad_request(message):
+    return web.json_response({"error": message}, status=400)
+
+def parse_dates(values):
+    if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+        raise ValueError("'dates' must be a list of ISO dates")
+    if len(values) > MAX_BATCH_DATES:
+        raise ValueError(f"At most {MAX_BATCH_DATES} dates per request")
+    return [climate.parse_date(value) for value in values]
+
+def date_range(start, end):
+    if end < start:
+        raise ValueError("'end' must not be before 'start'")
+    days = (end - start).days + 1
+    if days > MAX_BATCH_DATES:
+        raise ValueError(f"At most {MAX_BATCH_DATES} days per request")
+    return [start + datetime.timedelta(days=i) for i in range(days)]
+
+async def read_dates(request):
+    try:
+        body = await request.json()
+    except ValueError:
+        raise ValueError("Request body must be JSON")
+    if not isinstance(body, dict):
+        raise ValueError("Request body must be a JSON object")
+    return parse_dates(body.get("dates"))
+
+async def read_ranges(request):
+    try:
+        body = await request.json()
+    except ValueError:
+        raise ValueError("Request body must be JSON")
+    ranges = body.get("ranges") if isinstance(body, dict) else None
+    if not isinstance(ranges, list) or len(ranges) > MAX_BATCH_DATES:
+        raise ValueError(f"'ranges' must be a list of at most {MAX_BATCH_DATES} [start, end] pairs")
+    if not all(isinstance(pair, list) and len(pair) == 2 and all(isinstance(d, str) for d in pair)
+               for pair in ranges):
+        raise ValueError("Each range must be a [start, end] pair of ISO dates")
+    starts = [climate.parse_date(start) for start, _ in ranges]
+    ends = [climate.parse_date(end) for _, end in ranges]
+    for i, (start, end) in enumerate(zip(starts, ends)):
+        if end < start:
+            raise ValueError(f"Range {i}: 'end' must not be before 'start'")
+    return starts, ends
+
+def observed_payload(state, dates):
+    return [
+        {"date": date.isoformat(),
+         "tavg": climate.observed_temperature(state["df"], date, state["date_index"])}
+        for date in dates
+    ]
+
+def predict_payload(state, dates):
+    preds = climate.predict_temperatures(state["model"], dates)
+    return [{"date": date.isoformat(), "tavg": pred} for date, pred in zip(dates, preds)]
+
+# ------------------------
+# Handlers
+# ------------------------
+async def get_observed(request):
+    state = current_state(request)
+    try:
+        date = climate.parse_date(request.match_info["date"])
+    except ValueError:
+        return bad_request("Date must be in YYYY-MM-DD format")
+
+    result = observed_payload(state, [date])[0]
+    if result["tavg"] is None:
+        return web.json_response({"error": f"No historical data for {date}"}, status=404)
+    return web.json_response(result)
+
+async def post_observed(request):
+    state = current_state(request)
+    try:
+        dates = await read_dates(request)
+    except ValueError as e:
+        return bad_request(str(e))
+    return web.json_response({"results": observed_payload(state, dates)})
+
+async def get_predict(request):
+    state = current_state(request)
+    if state["model"] is None:
+        return web.json_response({"error": "Model not found"}, status=503)
+    try:
+        start = climate.parse_date(request.query["start"])
+        end = climate.parse_date(request.query.get("end", request.query["start"]))
+        dates = date_range(start, end)
+    except KeyError:
+        return bad_request("'start' query parameter is required")
+    except ValueError as e:
+        return bad_request(str(e))
+    return web.json_response({"results": predict_payload(state, dates)})
+
+async def post_predict(request):
+    state = current_state(request)
+    if state["model"] is None:
+        return web.json_response({"error": "Model not found"}, status=503)
+    try:
+        dates = await read_dates(request)
+    except ValueError as e:
+        return bad_request(str(e))
+    return web.json_response({"results": predict_payload(state, dates)})
+
+async def get_yearly(request):
+    state = current_state(request)
+    try:
+        year = int(request.match_info["year"])
+    except ValueError:
+        return bad_request("Year must be an integer")
+    baseline = request.query.get("baseline", "year")
+    if baseline not in climate.Z_SCORE_BASELINES:
+        return bad_request(f"'baseline' must be one of {', '.join(climate.Z_SCORE_BASELINES)}")
+    table = state["yearly_stats"][baseline]
+    if year not in table.index:
+        return web.json_response({"error": f"No historical data for {year}"}, status=404)
+    return web.json_response(climate.yearly_insights(table, year))
+
+async def get_range(request):
+    state = current_state(request)
+    try:
+        start = climate.parse_date(request.query["start"])
+        end = climate.parse_date(request.query["end"])
+    except KeyError:
+        return bad_request("'start' and 'end' query parameters are required")
+    except ValueError:
+        return bad_request("Dates must be in YYYY-MM-DD format")
+    if end < start:
+        return bad_request("'end' must not be before 'start'")
+    return web.json_response(state["range_stats"].query(start, end))
+
+async def post_range(request):
+    state = current_state(request)
+    try:
+        starts, ends = await read_ranges(request)
+    except ValueError as e:
+        return bad_request(str(e))
+    if not starts:
+        return web.json_response({"results": []})
+
+    results = state["range_stats"].query_many(starts, ends)
+    return web.json_response({
+        "results": [
+            {"start": start.isoformat(), "end": end.isoformat(), "days": int(row.days),
+             "mean": None if row.days == 0 else float(row.mean),
+             "min": None if row.days == 0 else float(row.min),
+             "max": None if row.days == 0 else float(row.max),
+             "hot_days": int(row.hot_days)}
+            for start, end, row in zip(starts, ends, results.itertuples())
+        ]
+    })
+
+async def get_anomalies(request):
+    state = current_state(request)
+    baseline = request.query.get("baseline", "climatology")
+    if baseline not in climate.Z_SCORE_BASELINES:
+        return bad_request(f"'baseline' must be one of {', '.join(climate.Z_SCORE_BASELINES)}")
+    anomalies = state["anomaly_engine"].yearly_spikes(baseline, climate.Z_SCORE_THRESHOLD)
+    year = request.query.get("year")
+    if year is not None:
+        try:
+            anomalies = anomalies.loc[[int(year)]]
+        except ValueError:
+            return bad_request("Year must be an integer")
+        except KeyError:
+            return web.json_response({"error": f"No historical data for {year}"}, status=404)
+    return web.json_response({
+        "results": [
+            {"year": int(y), "hot_spikes": int(row['hot-spike']), "cold_spikes": int(row['cold-spike'])}
+            for y, row in anomalies.iterrows()
+        ]
+    })
+
+# ------------------------
+# Application
+# ------------------------
+def load_state(csv_path=climate.CSV_PATH, model_path=climate.MODEL_PATH):
+    """Load the data and model once and build the in-memory indexes served by the API"""
+    # Read the version first so an update landing mid-load is picked up next poll
+    version = climate.data_version(csv_path=csv_path, model_path=model_path)
+    df = climate.load_data(csv_path)
+    engine = AnomalyEngine(df)
+    return {
+        "version": version,
+        "df": df,
+        "model": climate.load_model(model_path),
+        "date_index": climate.build_date_index(df),
+        "anomaly_engine": engine,
+        "range_stats": DateRangeStats(df),
+        "yearly_stats": {
+            baseline: climate.yearly_stats_table(df, baseline, engine)
+            for baseline in climate.Z_SCORE_BASELINES
+        },
+    }
+
+async def watch_pipeline(app):
+    """Poll the pipeline manifest and swap in freshly loaded state when it changes"""
+    store = app["store"]
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(POLL_SECONDS)
+        if climate.data_version() == store["state"]["version"]:
+            continue
+        try:
+            state = await loop.run_in_executor(None, load_state)
+        except Exception as e:
+            print(f"❌ Reload failed, still serving {store['state']['version']}: {e}")
+            continue
+        store["state"] = state
+        print(f"✅ Reloaded data and model ({state['version']})")
+
+async def pipeline_watcher(app):
+    task = asyncio.create_task(watch_pipeline(app))
+    yield
+    task.cancel()
+
+def create_app(state=None, watch=True):
+    app = web.Application()
+    app["store"] = {"state": state if state is not None else load_state()}
+    if watch:
+        app.cleanup_ctx.append(pipeline_watcher)
+    app.add_routes([
+        web.get("/observed/{date}", get_observed),
+        web.post("/observed", post_observed),
+        web.get("/predict", get_predict),
+        web.post("/predict", post_predict),
+        web.get("/yearly/{year}", get_yearly),
+        web.get("/anomalies", get_anomalies),
+        web.get("/range", get_range),
+        web.post("/range", post_range),
+    ])
+    return app
+
+# ------------------------
+# Entry Point
+# ------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dhaka weather JSON API")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+    web.run_app(create_app(), host=args.host, port=args.port)
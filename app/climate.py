@@ -0,0 +1,203 @@
+# app/climate.py
+import datetime
+import functools
+import json
+from pathlib import Path
+
+import joblib
+import pandas as pd
+
+from anomalies import BASELINES, AnomalyEngine
+
+# ------------------------
+# Configuration
+# ------------------------
+BASE_DIR = Path(__file__).resolve().parent.parent
+CSV_PATH = BASE_DIR / "data" / "dhaka_weather_cleaned.csv"
+MODEL_PATH = BASE_DIR / "models" / "temperature_model.joblib"
+MANIFEST_PATH = BASE_DIR / "data" / "manifest.json"
+
+HOT_THRESHOLD = 30
+EXTREME_HOT_THRESHOLD = 35
+COLD_THRESHOLD = 15
+EXTREME_COLD_THRESHOLD = 10
+Z_SCORE_THRESHOLD = 2
+Z_SCORE_BASELINES = tuple(BASELINES)
+YEARLY_FLOAT_COLUMNS = ("yearly_avg", "overall_avg", "diff")
+
+SEASON_MAP = {
+    1: "Winter", 2: "Winter", 3: "Spring",
+    4: "Summer", 5: "Summer", 6: "Summer",
+    7: "Monsoon", 8: "Monsoon", 9: "Monsoon",
+    10: "Autumn", 11: "Autumn", 12: "Winter"
+}
+SEASON_CATEGORIES = ["Autumn", "Monsoon", "Spring", "Winter", "Summer"]
+
+# ------------------------
+# Loading
+# ------------------------
+def load_data(csv_path=CSV_PATH):
+    """Load the cleaned CSV with the date parts used throughout the app.
+
+    Gaps and outliers are already handled by scripts/clean_data.py.
+    """
+    df = pd.read_csv(csv_path, parse_dates=["time"])
+    df['year'] = df['time'].dt.year
+    df['month'] = df['time'].dt.month
+    df['day'] = df['time'].dt.day
+    return df
+
+def load_model(model_path=MODEL_PATH):
+    """Load the trained model, or None if it has not been trained yet"""
+    model_path = Path(model_path)
+    if model_path.exists():
+        return joblib.load(model_path)
+    return None
+
+def data_version(manifest_path=MANIFEST_PATH, csv_path=CSV_PATH, model_path=MODEL_PATH):
+    """Identifier that changes whenever the pipeline rewrites the cleaned data or model.
+
+    Only the manifest's mtime is checked on each call; the manifest itself is
+    re-read when it changes. Without a manifest the output files' stats are used.
+    """
+    manifest_path = Path(manifest_path)
+    if manifest_path.exists():
+        return _manifest_version(str(manifest_path), manifest_path.stat().st_mtime_ns)
+
+    stats = [Path(p).stat() for p in (csv_path, model_path) if Path(p).exists()]
+    return "-".join(f"{stat.st_mtime_ns}:{stat.st_size}" for stat in stats)
+
+@functools.lru_cache(maxsize=4)
+def _manifest_version(manifest_path, mtime_ns):
+    manifest = json.loads(Path(manifest_path).read_text())
+    data_hash = manifest.get("cleaned_data", {}).get("sha256", "none")[:12]
+    model_hash = manifest.get("model", {}).get("version", "none")
+    return f"{data_hash}-{model_hash}"
+
+def build_date_index(df):
+    """Daily average temperature indexed by date for constant-time lookups"""
+    index = df.set_index(df['time'].dt.normalize())['tavg'].sort_index()
+    # Several stations share a date; lookups return their daily mean
+    if index.index.has_duplicates:
+        index = index.groupby(level=0).mean()
+    return index
+
+# ------------------------
+# Observations
+# ------------------------
+def observed_temperature(df, date, date_index=None):
+    """Observed average temperature for a date, or None if it is not in the data"""
+    if date_index is not None:
+        value = date_index.get(pd.Timestamp(date))
+        return None if value is None or pd.isna(value) else float(value)
+
+    day_data = df[(df['year'] == date.year) &
+                  (df['month'] == date.month) &
+                  (df['day'] == date.day)]
+    if day_data.empty or pd.isna(day_data.iloc[0]['tavg']):
+        return None
+    return float(day_data.iloc[0]['tavg'])
+
+def yearly_stats_table(df, baseline="year", engine=None):
+    """Per-year temperature, extreme-day and spike statistics in one vectorized pass.
+
+    ``baseline`` names the z-score baseline from ``anomalies.BASELINES``; pass
+    the data's ``AnomalyEngine`` to reuse its cached z-scores.
+    """
+    engine = engine or AnomalyEngine(df)
+    temps = df['tavg']
+    hot = temps > HOT_THRESHOLD
+    extreme_hot = temps > EXTREME_HOT_THRESHOLD
+    cold = temps < COLD_THRESHOLD
+    extreme_cold = temps < EXTREME_COLD_THRESHOLD
+    zscores = engine.zscores(baseline)
+
+    table = pd.DataFrame({
+        "hot_days": hot & ~extreme_hot,
+        "cold_days": cold & ~extreme_cold,
+        "extreme_hot_days": extreme_hot,
+        "extreme_cold_days": extreme_cold,
+        "hot_spikes": zscores > Z_SCORE_THRESHOLD,
+        "cold_spikes": zscores < -Z_SCORE_THRESHOLD,
+    }).groupby(df['year']).sum().astype(int)
+    # Spikes are unknown, not zero, in years without any z-score (e.g. no rolling baseline yet)
+    scored = zscores.notna().groupby(df['year']).any()
+    for name in ("hot_spikes", "cold_spikes"):
+        table[name] = table[name].where(scored).astype("Int64")
+
+    overall_avg = temps.mean()
+    table.insert(0, "yearly_avg", temps.groupby(df['year']).mean())
+    table.insert(1, "overall_avg", overall_avg)
+    table.insert(2, "diff", table['yearly_avg'] - overall_avg)
+    # Years whose temperatures were all left missing by cleaning have no statistics
+    return table[table['yearly_avg'].notna()]
+
+def yearly_insights(table, year):
+    """Statistics for a single year, looked up from ``yearly_stats_table``; unknown counts are None"""
+    row = table.loc[year]
+    stats = {"year": int(year)}
+    stats.update({
+        name: None if pd.isna(row[name]) else float(row[name]) if name in YEARLY_FLOAT_COLUMNS else int(row[name])
+        for name in table.columns
+    })
+    return stats
+
+# ------------------------
+# Projections
+# ------------------------
+def build_features(dates):
+    """Model input frame for a sequence of dates"""
+    dates = pd.DatetimeIndex(pd.to_datetime(list(dates)))
+    features = pd.DataFrame({
+        "year": dates.year,
+        "month": dates.month,
+        "day": dates.day,
+    })
+    seasons = features['month'].map(SEASON_MAP)
+    for cat in SEASON_CATEGORIES:
+        features[f"season_{cat}"] = (seasons == cat).astype(int)
+    return features
+
+def predict_temperatures(model, dates):
+    """Predicted average temperature for each date, in a single model call"""
+    features = build_features(dates)
+    if features.empty:
+        return []
+    return [float(pred) for pred in model.predict(features)]
+
+def projection_insights(df, engine=None):
+    """Long-term baselines used to put a predicted temperature in context.
+
+    Every figure is independent of the date being predicted, so callers compute
+    this once per data version and reuse it for every prediction.
+    """
+    overall_avg = df['tavg'].mean()
+    decade_avg = df.loc[df['year'] >= df['year'].max() - 9, 'tavg'].mean()
+
+    # Extreme and spike days per year in a single grouped pass
+    zscores = (engine or AnomalyEngine(df)).zscores("climatology")
+    yearly_counts = pd.DataFrame({
+        "hot_days": df['tavg'] > HOT_THRESHOLD,
+        "extreme_hot_days": df['tavg'] > EXTREME_HOT_THRESHOLD,
+        "cold_days": df['tavg'] < COLD_THRESHOLD,
+        "extreme_cold_days": df['tavg'] < EXTREME_COLD_THRESHOLD,
+        "hot_spikes": zscores > Z_SCORE_THRESHOLD,
+        "cold_spikes": zscores < -Z_SCORE_THRESHOLD,
+    }).groupby(df['year']).sum()
+    yearly_counts = yearly_counts[df['tavg'].groupby(df['year']).count() > 0]
+
+    # Extremes are averaged over the years in which they occurred at all
+    extremes = ["hot_days", "extreme_hot_days", "cold_days", "extreme_cold_days"]
+    averages = yearly_counts[extremes].where(yearly_counts[extremes] > 0).mean()
+    averages = pd.concat([averages, yearly_counts[["hot_spikes", "cold_spikes"]].mean()])
+
+    stats = {
+        "overall_avg": float(overall_avg),
+        "decade_avg": float(decade_avg),
+    }
+    stats.update({name: float(value) for name, value in averages.items()})
+    return stats
+
+def parse_date(value):
+    """Parse an ISO date string into a datetime.date"""
+    return datetime.date.fromisoformat(value)
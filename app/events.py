@@ -0,0 +1,73 @@
+# app/events.py
+import numpy as np
+import pandas as pd
+
+# ------------------------
+# Configuration
+# ------------------------
+HEATWAVE_THRESHOLD = 30
+COLD_SPELL_THRESHOLD = 15
+MIN_EVENT_DAYS = 3
+ONE_DAY = np.timedelta64(1, 'D')
+
+EVENT_COLUMNS = ["type", "start", "end", "duration", "peak"]
+
+# ------------------------
+# Run-length encoding
+# ------------------------
+def threshold_runs(df, column, threshold, above=True, min_days=MIN_EVENT_DAYS):
+    """Runs of at least ``min_days`` consecutive days beyond ``threshold``.
+
+    Runs are found with vectorized run-length encoding and never bridge a
+    missing day or a change of station. Returns a frame of start, end,
+    duration and peak (the maximum for runs above, the minimum for runs below).
+    """
+    values = df[column].to_numpy(dtype=float)
+    time = df['time'].to_numpy()
+    hit = values > threshold if above else values < threshold
+
+    # A run starts on a hit day that does not continue a hit from the previous day
+    continues = np.zeros(len(df), dtype=bool)
+    continues[1:] = hit[:-1] & (time[1:] - time[:-1] == ONE_DAY)
+    if 'station' in df.columns:
+        station = df['station'].to_numpy()
+        continues[1:] &= station[1:] == station[:-1]
+    starts = hit & ~continues
+
+    hit_pos = np.flatnonzero(hit)
+    run_offsets = np.flatnonzero(starts[hit_pos])
+    if run_offsets.size == 0:
+        return pd.DataFrame({
+            "start": pd.Series(dtype='datetime64[ns]'), "end": pd.Series(dtype='datetime64[ns]'),
+            "duration": pd.Series(dtype='int16'), "peak": pd.Series(dtype='float32'),
+        })
+    durations = np.diff(np.append(run_offsets, hit_pos.size))
+    start_pos = hit_pos[run_offsets]
+    reduce = np.maximum if above else np.minimum
+    peaks = reduce.reduceat(values[hit_pos], run_offsets)
+
+    keep = durations >= min_days
+    return pd.DataFrame({
+        "start": time[start_pos[keep]],
+        "end": time[start_pos[keep] + durations[keep] - 1],
+        "duration": durations[keep].astype('int16'),
+        "peak": peaks[keep].astype('float32'),
+    })
+
+def detect_events(df, column='calc_tavg', min_days=MIN_EVENT_DAYS):
+    """Heatwaves and cold spells in one compact table, ordered by start date"""
+    if column not in df.columns:
+        column = 'tavg'
+    heatwaves = threshold_runs(df, column, HEATWAVE_THRESHOLD, above=True, min_days=min_days)
+    cold_spells = threshold_runs(df, column, COLD_SPELL_THRESHOLD, above=False, min_days=min_days)
+    heatwaves.insert(0, "type", "heatwave")
+    cold_spells.insert(0, "type", "cold spell")
+
+    events = pd.concat([heatwaves, cold_spells], ignore_index=True)
+    events["type"] = pd.Categorical(events["type"], categories=["heatwave", "cold spell"])
+    return events.sort_values("start", ignore_index=True)[EVENT_COLUMNS]
+
+def yearly_event_counts(events):
+    """Number of heatwaves and cold spells starting in each year"""
+    counts = events.groupby([events['start'].dt.year.rename('year'), 'type'], observed=False).size()
+    return counts.unstack(fill_value=0)
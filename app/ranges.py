@@ -0,0 +1,91 @@
+# app/ranges.py
+import numpy as np
+import pandas as pd
+
+from climate import HOT_THRESHOLD
+
+# ------------------------
+# Range statistics
+# ------------------------
+class DateRangeStats:
+    """Mean, min, max and hot-day count between any two dates in O(1) per query.
+
+    Sums and counts come from prefix-sum arrays; min and max come from sparse
+    tables holding the extreme of every power-of-two window, so any range is
+    covered by two overlapping windows. Built once per data version.
+    """
+
+    def __init__(self, df, column='tavg', hot_threshold=HOT_THRESHOLD):
+        daily = df[['time', column]]
+        # Several stations share a date; range queries are over the daily mean
+        if daily['time'].duplicated().any():
+            daily = daily.groupby('time', as_index=False)[column].mean()
+        daily = daily.sort_values('time')
+
+        self.dates = daily['time'].to_numpy(dtype='datetime64[ns]')
+        values = daily[column].to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        self.count = np.concatenate([[0], np.cumsum(valid)])
+        # Sums are taken around the overall mean to limit floating-point drift
+        self.center = float(np.nanmean(values)) if valid.any() else 0.0
+        self.total = np.concatenate([[0.0], np.cumsum(np.where(valid, values - self.center, 0.0))])
+        self.hot = np.concatenate([[0], np.cumsum(values > hot_threshold)])
+        self.min_table = self._sparse_table(values, np.fmin)
+        self.max_table = self._sparse_table(values, np.fmax)
+
+    @staticmethod
+    def _sparse_table(values, combine):
+        """Row k holds ``combine`` over the 2**k values starting at each position"""
+        levels = max(1, int(np.log2(len(values))) + 1) if len(values) else 1
+        table = np.full((levels, len(values)), np.nan)
+        table[0] = values
+        for k in range(1, levels):
+            half = 1 << (k - 1)
+            width = len(values) - 2 * half + 1
+            table[k, :width] = combine(table[k - 1, :width], table[k - 1, half:half + width])
+        return table
+
+    def query_many(self, starts, ends):
+        """Statistics for each inclusive [start, end] date range, answered together"""
+        starts = np.asarray(starts, dtype='datetime64[ns]')
+        ends = np.asarray(ends, dtype='datetime64[ns]')
+        lo = np.searchsorted(self.dates, starts, side='left')
+        hi = np.searchsorted(self.dates, ends, side='right')
+        hi = np.maximum(hi, lo)
+        length = hi - lo
+
+        days = self.count[hi] - self.count[lo]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = (self.total[hi] - self.total[lo]) / days + self.center
+
+        # Two power-of-two windows starting at lo and ending at hi cover the range
+        nonempty = length > 0
+        k = np.zeros_like(length)
+        k[nonempty] = np.log2(length[nonempty]).astype(int)
+        left = np.minimum(lo, len(self.dates) - 1)
+        right = np.clip(hi - (1 << k), 0, None)
+        range_min = np.where(nonempty, np.fmin(self.min_table[k, left], self.min_table[k, right]), np.nan)
+        range_max = np.where(nonempty, np.fmax(self.max_table[k, left], self.max_table[k, right]), np.nan)
+
+        return pd.DataFrame({
+            "start": starts,
+            "end": ends,
+            "days": days,
+            "mean": np.where(days > 0, mean, np.nan),
+            "min": range_min,
+            "max": range_max,
+            "hot_days": self.hot[hi] - self.hot[lo],
+        })
+
+    def query(self, start, end):
+        """Statistics for a single inclusive date range"""
+        row = self.query_many([start], [end]).iloc[0]
+        return {
+            "start": row['start'].date().isoformat(),
+            "end": row['end'].date().isoformat(),
+            "days": int(row['days']),
+            "mean": None if pd.isna(row['mean']) else float(row['mean']),
+            "min": None if pd.isna(row['min']) else float(row['min']),
+            "max": None if pd.isna(row['max']) else float(row['max']),
+            "hot_days": int(row['hot_days']),
+        }
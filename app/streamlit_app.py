@@ -1,8 +1,6 @@
 # app/streamlit_app.py
 import os
 import streamlit as st
-import pandas as pd
-import joblib
 from pathlib import Path
 import calendar
 import datetime
@@ -10,6 +8,10 @@ import seaborn as sns
 import matplotlib.pyplot as plt
 import time
 
+import climate
+from anomalies import AnomalyEngine
+from ranges import DateRangeStats
+from events import MIN_EVENT_DAYS, HEATWAVE_THRESHOLD, COLD_SPELL_THRESHOLD, detect_events, yearly_event_counts
 from styles import get_base_styles, get_date_input_styles
 from components import styled_badge, show_loading_spinner, display_temperature_card
 
@@ -24,21 +26,31 @@ st.title("📈 Dhaka Weather Patterns & Predictor")
 # Inject CSS styles
 st.markdown(get_base_styles(), unsafe_allow_html=True)
 
-@st.cache_data
-def load_data():
-    df = pd.read_csv(csv_path, parse_dates=["time"])
-    df['year'] = df['time'].dt.year
-    df['month'] = df['time'].dt.month
-    df['day'] = df['time'].dt.day
-    df['tavg'] = df['tavg'].interpolate()
-    return df
-
-@st.cache_resource
-def load_model():
-    model_path = Path(trained_model_path)
-    if model_path.exists():
-        return joblib.load(model_path)
-    return None
+# The snapshot is keyed on the pipeline version read from the manifest, so a
+# rerun picks up newly cleaned data or a retrained model without a restart while
+# runs already in progress keep the snapshot they started with.
+@st.cache_resource(max_entries=2)
+def load_snapshot(data_version):
+    """Data, model and every derived index for one pipeline version, shared by all sessions.
+
+    Everything is built together from a single read of the files, so a run never
+    mixes one version's data with another's aggregates. Treat it as read-only.
+    """
+    df = climate.load_data(csv_path)
+    engine = AnomalyEngine(df)
+    return {
+        "df": df,
+        "model": climate.load_model(trained_model_path),
+        "date_index": climate.build_date_index(df),
+        "anomaly_engine": engine,
+        "projection_stats": climate.projection_insights(df, engine),
+        "yearly_stats": {
+            baseline: climate.yearly_stats_table(df, baseline, engine)
+            for baseline in climate.Z_SCORE_BASELINES
+        },
+        "events": detect_events(df),
+        "range_stats": DateRangeStats(df),
+    }
 
 def plot_trends(df):
     yearly = df.groupby('year')['tavg'].agg(['mean', 'min', 'max']).reset_index()
@@ -52,8 +64,8 @@ def plot_trends(df):
     plt.close()
 
 def plot_extremes(df):
-    df['extreme'] = df['tavg'].apply(lambda x: 'hot' if x > 30 else 'cold' if x < 15 else 'normal')
-    extreme_counts = df.groupby(['year', 'extreme']).size().unstack(fill_value=0)
+    extreme = df['tavg'].apply(lambda x: 'hot' if x > 30 else 'cold' if x < 15 else 'normal').rename('extreme')
+    extreme_counts = df.groupby(['year', extreme]).size().unstack(fill_value=0)
 
     # Ensure 'hot' and 'cold' columns always exist
     for col in ['hot', 'cold']:
@@ -87,18 +99,9 @@ def plot_monthly_heatmap(df):
     st.pyplot(plt.gcf())
     plt.close()
 
-def plot_anomalies(df):
-    df['month_avg'] = df.groupby('month')['tavg'].transform('mean')
-    df['zscore'] = (df['tavg'] - df['month_avg']) / df.groupby('month')['tavg'].transform('std')
-    df['anomaly'] = df['zscore'].apply(lambda z: 'hot-spike' if z > 2 else 'cold-spike' if z < -2 else 'normal')
-    anomalies = df.groupby(['year', 'anomaly']).size().unstack(fill_value=0)
-    for col in ['hot-spike', 'cold-spike']:
-        if col not in anomalies.columns:
-            anomalies[col] = 0
-    anomalies = anomalies[['hot-spike', 'cold-spike'] + [c for c in anomalies.columns if c not in ['hot-spike', 'cold-spike']]]
-    
+def plot_anomalies(anomalies):
     # Plot with specific colors
-    ax = anomalies[['hot-spike', 'cold-spike']].plot(
+    anomalies[['hot-spike', 'cold-spike']].plot(
         figsize=(12, 6),
         color={'hot-spike': 'gold', 'cold-spike': 'blue'}
     )
@@ -108,16 +111,146 @@ def plot_anomalies(df):
     st.pyplot(plt.gcf())
     plt.close()
 
+def display_range_insights(range_stats, start, end):
+    """Display mean, min, max and hot-day count for a date range"""
+    stats = range_stats.query(start, end)
+    if stats['days'] == 0:
+        st.warning("No historical data in this date range.")
+        return
+
+    st.markdown(f"""
+        <div style="
+            padding: 15px;
+            border-radius: 12px;
+            background-color: #2f3e46;
+            border: 1.5px solid #52796f;
+            box-shadow: 2px 2px 8px rgba(82, 121, 111, 0.5);
+            color: white;
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            margin-bottom: 20px;
+        ">
+            <h3 style="color: #84a98c; margin-top: 0;">{start} → {end} ({stats['days']} days)</h3>
+            <p style="font-size:16px; margin: 8px 0;">
+                <b>Mean temperature:</b> {stats['mean']:.2f} °C
+            </p>
+            <p style="font-size:16px; margin: 8px 0;">
+                <b style="color:#8ecae6;">Minimum:</b> {stats['min']:.1f} °C &nbsp;
+                <b style="color:#ff9f1c;">Maximum:</b> {stats['max']:.1f} °C
+            </p>
+            <p style="font-size:16px; margin: 8px 0;">
+                <b style="color:#ff9f1c;">Hot days (>{climate.HOT_THRESHOLD}°C):</b> {stats['hot_days']}
+            </p>
+        </div>
+    """, unsafe_allow_html=True)
+
+def parse_range_lines(text):
+    """Split 'start,end' lines into date pairs, collecting lines that do not parse or end before they start"""
+    starts, ends, invalid = [], [], []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        try:
+            start, end = (climate.parse_date(part.strip()) for part in line.split(','))
+        except ValueError:
+            invalid.append(line)
+            continue
+        if end < start:
+            invalid.append(line)
+            continue
+        starts.append(start)
+        ends.append(end)
+    return starts, ends, invalid
+
+def display_range_batch(range_stats):
+    """Batch form answering many date-range queries at once"""
+    with st.form("range_batch"):
+        text = st.text_area(
+            "One range per line as start,end (YYYY-MM-DD)",
+            value="2000-01-01,2000-12-31\n2020-04-01,2020-05-31"
+        )
+        submitted = st.form_submit_button("Run queries")
+
+    if not submitted:
+        return
+    starts, ends, invalid = parse_range_lines(text)
+    if invalid:
+        st.warning(f"Skipped {len(invalid)} invalid line(s), expected start,end with end not before start: "
+                   f"{', '.join(invalid)}")
+    if starts:
+        results = range_stats.query_many(starts, ends)
+        st.dataframe(
+            results.assign(start=results['start'].dt.date, end=results['end'].dt.date).round(2),
+            hide_index=True
+        )
+
+def display_events(events):
+    """Summarize heatwaves and cold spells with yearly counts and the event table"""
+    st.markdown(f"""
+    <h3 style="font-size:26px; font-weight:600; margin-top:10px; margin-bottom:20px;">
+        🥵 Heatwaves & Cold Spells
+    </h3>
+    <p style="font-size:16px;">
+        Runs of at least {MIN_EVENT_DAYS} consecutive days above {HEATWAVE_THRESHOLD}°C (heatwaves)
+        or below {COLD_SPELL_THRESHOLD}°C (cold spells).
+    </p>
+    """, unsafe_allow_html=True)
+
+    heatwaves = events[events['type'] == 'heatwave']
+    cold_spells = events[events['type'] == 'cold spell']
+
+    cols = st.columns(2)
+    with cols[0]:
+        st.markdown(styled_badge(f"Heatwaves: {len(heatwaves)}", "#e76f51"), unsafe_allow_html=True)
+        if not heatwaves.empty:
+            longest = heatwaves.loc[heatwaves['duration'].idxmax()]
+            st.markdown(styled_badge(f"Longest: {longest['duration']} days ({longest['start']:%Y-%m-%d})", "#d62828"), unsafe_allow_html=True)
+            st.markdown(styled_badge(f"Hottest peak: {heatwaves['peak'].max():.1f}°C", "#d62828"), unsafe_allow_html=True)
+    with cols[1]:
+        st.markdown(styled_badge(f"Cold Spells: {len(cold_spells)}", "#1d3557"), unsafe_allow_html=True)
+        if not cold_spells.empty:
+            longest = cold_spells.loc[cold_spells['duration'].idxmax()]
+            st.markdown(styled_badge(f"Longest: {longest['duration']} days ({longest['start']:%Y-%m-%d})", "#003049"), unsafe_allow_html=True)
+            st.markdown(styled_badge(f"Coldest peak: {cold_spells['peak'].min():.1f}°C", "#003049"), unsafe_allow_html=True)
+
+    if events.empty:
+        st.info("No events detected.")
+        return
+
+    yearly_event_counts(events).plot(
+        kind='bar',
+        stacked=True,
+        figsize=(14, 6),
+        color=['orange', 'blue']  # matches ['heatwave', 'cold spell']
+    )
+    plt.title("Heatwaves and Cold Spells per Year")
+    plt.ylabel("Events")
+    st.pyplot(plt.gcf())
+    plt.close()
+
+    st.dataframe(
+        events.sort_values('start', ascending=False).assign(
+            start=lambda e: e['start'].dt.date,
+            end=lambda e: e['end'].dt.date,
+            peak=lambda e: e['peak'].round(1)
+        ),
+        hide_index=True
+    )
+
 # app/streamlit_app.py (updated section)
 
-def display_historical_insights(df, selected_date):
+ZSCORE_BASELINE_LABELS = {
+    "year": "monthly averages of the selected year",
+    "climatology": "long-term monthly averages",
+    "day-of-year": "smoothed long-term day-of-year averages",
+    "rolling-30y": "smoothed day-of-year averages of the 30 years up to the selected year (from 10 years of data on)",
+}
+
+def display_historical_insights(df, date_index, yearly_stats, selected_date, baseline):
     """Display historical data insights with detailed statistics"""
-    day_data = df[(df['year'] == selected_date.year) & 
-                  (df['month'] == selected_date.month) & 
-                  (df['day'] == selected_date.day)]
+    temp = climate.observed_temperature(df, selected_date, date_index)
     
-    if not day_data.empty:
-        display_temperature_card(selected_date, day_data.iloc[0]['tavg'])
+    if temp is not None:
+        display_temperature_card(selected_date, temp)
     else:
         st.warning("No historical data for this date.")
         return
@@ -129,26 +262,13 @@ def display_historical_insights(df, selected_date):
     """, unsafe_allow_html=True)
     
     # Calculate all the required metrics
-    yearly_avg = df[df['year'] == selected_date.year]['tavg'].mean()
-    overall_avg = df['tavg'].mean()
-    diff = yearly_avg - overall_avg
-    
-    # Extreme days calculation
-    yearly_data = df[df['year'] == selected_date.year].copy()
-    yearly_data['extreme'] = yearly_data['tavg'].apply(
-        lambda x: 'extreme hot' if x > 35 else
-                  'hot' if x > 30 else
-                  'extreme cold' if x < 10 else
-                  'cold' if x < 15 else
-                  'normal'
-    )
-    extreme_counts = yearly_data['extreme'].value_counts()
-    
-    # Anomalies calculation
-    yearly_data['month_avg'] = yearly_data.groupby('month')['tavg'].transform('mean')
-    yearly_data['zscore'] = (yearly_data['tavg'] - yearly_data['month_avg']) / yearly_data.groupby('month')['tavg'].transform('std')
-    hot_spikes = (yearly_data['zscore'] > 2).sum()
-    cold_spikes = (yearly_data['zscore'] < -2).sum()
+    stats = climate.yearly_insights(yearly_stats, selected_date.year)
+    yearly_avg = stats['yearly_avg']
+    overall_avg = stats['overall_avg']
+    diff = stats['diff']
+    # Spike counts are unknown where the baseline gives no z-scores for the year
+    hot_spikes = "n/a" if stats['hot_spikes'] is None else stats['hot_spikes']
+    cold_spikes = "n/a" if stats['cold_spikes'] is None else stats['cold_spikes']
     
     # Create two columns for better layout
     col1, col2 = st.columns(2)
@@ -194,16 +314,16 @@ def display_historical_insights(df, selected_date):
             ">
                 <h3 style="color: #84a98c; margin-top: 0;">Extreme Days Count</h3>
                 <p style="font-size:16px; margin: 8px 0;">
-                    <b style="color:#ff9f1c;">Hot days (>30°C):</b> {extreme_counts.get('hot', 0)}
+                    <b style="color:#ff9f1c;">Hot days (>30°C):</b> {stats['hot_days']}
                 </p>
                 <p style="font-size:16px; margin: 8px 0;">
-                    <b style="color:#a8dadc;">Cold days (<15°C):</b> {extreme_counts.get('cold', 0)}
+                    <b style="color:#a8dadc;">Cold days (<15°C):</b> {stats['cold_days']}
                 </p>
                 <p style="font-size:16px; margin: 8px 0;">
-                    <b style="color:#e63946;">Extreme hot days (>35°C):</b> {extreme_counts.get('extreme hot', 0)}
+                    <b style="color:#e63946;">Extreme hot days (>35°C):</b> {stats['extreme_hot_days']}
                 </p>
                 <p style="font-size:16px; margin: 8px 0;">
-                    <b style="color:#457b9d;">Extreme cold days (<10°C):</b> {extreme_counts.get('extreme cold', 0)}
+                    <b style="color:#457b9d;">Extreme cold days (<10°C):</b> {stats['extreme_cold_days']}
                 </p>
             </div>
         """, unsafe_allow_html=True)
@@ -229,7 +349,7 @@ def display_historical_insights(df, selected_date):
                     <b style="color:#8ecae6;">Cold spike days (z < -2):</b> {cold_spikes}
                 </p>
                 <p style="font-size:14px; margin: 8px 0; color: #b7b7a4;">
-                    <i>Anomalies are calculated relative to monthly averages</i>
+                    <i>Anomalies are calculated relative to {ZSCORE_BASELINE_LABELS[baseline]}</i>
                 </p>
             </div>
         """, unsafe_allow_html=True)
@@ -244,41 +364,23 @@ def display_historical_insights(df, selected_date):
         cols = st.columns(2)
         with cols[0]:
             st.markdown(styled_badge(f"Avg Temp: {yearly_avg:.1f}°C", "#2a9d8f"), unsafe_allow_html=True)
-            st.markdown(styled_badge(f"Hot Days: {extreme_counts.get('hot', 0)}", "#e76f51"), unsafe_allow_html=True)
+            st.markdown(styled_badge(f"Hot Days: {stats['hot_days']}", "#e76f51"), unsafe_allow_html=True)
             st.markdown(styled_badge(f"Hot Spikes: {hot_spikes}", "#d62828"), unsafe_allow_html=True)
         
         with cols[1]:
             st.markdown(styled_badge(f"Diff: {diff:+.2f}°C", "#457b9d"), unsafe_allow_html=True)
-            st.markdown(styled_badge(f"Cold Days: {extreme_counts.get('cold', 0)}", "#1d3557"), unsafe_allow_html=True)
+            st.markdown(styled_badge(f"Cold Days: {stats['cold_days']}", "#1d3557"), unsafe_allow_html=True)
             st.markdown(styled_badge(f"Cold Spikes: {cold_spikes}", "#003049"), unsafe_allow_html=True)
         
         st.markdown("</div>", unsafe_allow_html=True)
-def display_future_prediction(model, df, selected_date):
+def display_future_prediction(model, stats, selected_date):
     """Display future prediction results with consistent styling"""
     if model is None:
         st.error("Model not found. Please train and save the model first.")
         return
     
     with st.spinner("Predicting future temperature..."):
-        # Determine season for selected_date
-        season_map = {
-            1: "Winter", 2: "Winter", 3: "Spring",
-            4: "Summer", 5: "Summer", 6: "Summer",
-            7: "Monsoon", 8: "Monsoon", 9: "Monsoon",
-            10: "Autumn", 11: "Autumn", 12: "Winter"
-        }
-        season = season_map.get(selected_date.month, "Winter")
-        season_categories = ["Autumn", "Monsoon", "Spring", "Winter", "Summer"]
-        # Build input with all required columns
-        input_dict = {
-            "year": selected_date.year,
-            "month": selected_date.month,
-            "day": selected_date.day
-        }
-        for cat in season_categories:
-            input_dict[f"season_{cat}"] = 1 if cat == season else 0
-        input_df = pd.DataFrame([input_dict])
-        pred = model.predict(input_df)[0]
+        pred = climate.predict_temperatures(model, [selected_date])[0]
         
         display_temperature_card(selected_date, pred, is_predicted=True)
         
@@ -288,23 +390,20 @@ def display_future_prediction(model, df, selected_date):
         </h3>
         """, unsafe_allow_html=True)
         
-        # Calculate all required metrics
-        overall_avg = df['tavg'].mean()
-        past_decade = df[df['year'] >= df['year'].max() - 9]
-        decade_avg = past_decade['tavg'].mean()
+        # Metrics come from the shared per-data-version stats
+        overall_avg = stats['overall_avg']
+        decade_avg = stats['decade_avg']
         diff = pred - overall_avg
         
         # Historical extremes for projection
-        hot_days = df[df['tavg'] > 30].groupby('year').size().mean()
-        extreme_hot_days = df[df['tavg'] > 35].groupby('year').size().mean()
-        cold_days = df[df['tavg'] < 15].groupby('year').size().mean()
-        extreme_cold_days = df[df['tavg'] < 10].groupby('year').size().mean()
+        hot_days = stats['hot_days']
+        extreme_hot_days = stats['extreme_hot_days']
+        cold_days = stats['cold_days']
+        extreme_cold_days = stats['extreme_cold_days']
         
         # Anomalies projection
-        df['month_avg'] = df.groupby('month')['tavg'].transform('mean')
-        df['zscore'] = (df['tavg'] - df['month_avg']) / df.groupby('month')['tavg'].transform('std')
-        hot_spikes = (df['zscore'] > 2).groupby(df['time'].dt.year).sum().mean()
-        cold_spikes = (df['zscore'] < -2).groupby(df['time'].dt.year).sum().mean()
+        hot_spikes = stats['hot_spikes']
+        cold_spikes = stats['cold_spikes']
         
         # Create two columns for layout
         col1, col2 = st.columns(2)
@@ -414,16 +513,19 @@ def display_future_prediction(model, df, selected_date):
             st.markdown("</div>", unsafe_allow_html=True)
             
 # Main app logic
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
+tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
     "🌡️ Temperature",
     "📊 Climate",
     "🔥 Extremes",
     "🌀 Patterns",
-    "⛈️ Anomalies"
+    "⛈️ Anomalies",
+    "🥵 Events"
 ])
 
-df = load_data()
-model = load_model()
+data_version = climate.data_version(csv_path=csv_path, model_path=trained_model_path)
+snapshot = load_snapshot(data_version)
+df = snapshot["df"]
+model = snapshot["model"]
 today = datetime.date.today()
 max_future_year = 2075
 
@@ -438,6 +540,13 @@ with tab1:
         max_value=datetime.date(max_future_year, 12, 31)
     )
 
+    zscore_baseline = st.radio(
+        "Anomaly baseline",
+        options=list(climate.Z_SCORE_BASELINES),
+        format_func=lambda b: ZSCORE_BASELINE_LABELS[b].capitalize(),
+        horizontal=True
+    )
+
     if 'last_date' not in st.session_state:
         st.session_state.last_date = selected_date
 
@@ -449,11 +558,35 @@ with tab1:
             time.sleep(1)
 
     if selected_date <= today:
-        display_historical_insights(df, selected_date)
+        yearly_stats = snapshot["yearly_stats"][zscore_baseline]
+        display_historical_insights(df, snapshot["date_index"], yearly_stats, selected_date, zscore_baseline)
     else:
-        display_future_prediction(model, df, selected_date)
+        display_future_prediction(model, snapshot["projection_stats"], selected_date)
+
+    st.markdown("<h3 style='font-size:24px;'>📆 Select a Date Range for Statistics</h3>", unsafe_allow_html=True)
+    first_date, last_date = df['time'].min().date(), df['time'].max().date()
+    selected_range = st.date_input(
+        label="Date range",
+        value=(max(first_date, last_date - datetime.timedelta(days=29)), last_date),
+        min_value=first_date,
+        max_value=last_date
+    )
+    range_stats = snapshot["range_stats"]
+    if len(selected_range) == 2:
+        display_range_insights(range_stats, *selected_range)
+    else:
+        st.info("Select an end date to see statistics for the range.")
+    display_range_batch(range_stats)
 
 with tab2: plot_trends(df)
 with tab3: plot_extremes(df)
 with tab4: plot_monthly_heatmap(df)
-with tab5: plot_anomalies(df)
\ No newline at end of file
+with tab5:
+    anomaly_baseline = st.selectbox(
+        "Anomaly baseline",
+        options=list(climate.Z_SCORE_BASELINES),
+        index=list(climate.Z_SCORE_BASELINES).index("climatology"),
+        format_func=lambda b: ZSCORE_BASELINE_LABELS[b].capitalize()
+    )
+    plot_anomalies(snapshot["anomaly_engine"].yearly_spikes(anomaly_baseline, climate.Z_SCORE_THRESHOLD))
+with tab6: display_events(snapshot["events"])
\ No newline at end of file
@@ -0,0 +1,250 @@
+# benchmarks/run_benchmarks.py
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+# ------------------------
+# Paths
+# ------------------------
+BENCH_DIR = Path(__file__).resolve().parent
+BASE_DIR = BENCH_DIR.parent
+RESULTS_DIR = BENCH_DIR / "results"
+BASELINE_JSON = BENCH_DIR / "baseline.json"
+
+sys.path[:0] = [str(BASE_DIR / "app"), str(BASE_DIR / "scripts")]
+
+import streamlit_stub
+from synthetic import write_synthetic_raw_weather
+
+streamlit_stub.install()
+
+import climate
+from anomalies import BASELINES, AnomalyEngine
+from events import detect_events
+from ranges import DateRangeStats
+import clean_data
+import generate_plots
+import manifest
+import streamlit_app
+import train_model
+
+# ------------------------
+# Configuration
+# ------------------------
+DEFAULT_SCALES = [1, 10, 100]
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_MEMORY_THRESHOLD = 0.20
+# Differences smaller than these are noise, whatever the ratio
+MIN_DELTA_S = 0.005
+MIN_DELTA_MB = 1.0
+HISTORICAL_DATE = datetime.date(2000, 5, 1)
+FUTURE_DATE = datetime.date(2040, 5, 1)
+RANGE_QUERIES = 10000
+
+# ------------------------
+# Measurement
+# ------------------------
+def measure(func, setup=None, repeat=DEFAULT_REPEAT):
+    """Median/min wall time over ``repeat`` runs plus peak traced memory of one more run.
+
+    ``setup`` returns the call's arguments and is not timed. Memory is traced
+    in a separate run because tracemalloc slows down the timed code.
+    """
+    setup = setup or (lambda: ())
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            args = setup()
+            start = time.perf_counter()
+            func(*args)
+            timings.append(time.perf_counter() - start)
+
+        args = setup()
+        tracemalloc.start()
+        try:
+            func(*args)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+        "peak_mb": peak / 2**20,
+    }
+
+def run_scale(stations, repeat, workdir):
+    """Benchmark the pipeline and app hot paths on a synthetic dataset"""
+    raw_csv = workdir / "weather.csv"
+    cleaned_csv = workdir / "weather_cleaned.csv"
+    model_path = workdir / "model.joblib"
+    rows = write_synthetic_raw_weather(raw_csv, stations=stations)
+
+    # Point every pipeline stage at the synthetic files
+    manifest.MANIFEST_PATH = workdir / "manifest.json"
+    train_model.CSV_FILE = cleaned_csv
+    train_model.MODEL_PATH = model_path
+    generate_plots.CSV_FILE = cleaned_csv
+    generate_plots.VIS_DIR = workdir / "visualizations"
+    generate_plots.VIS_DIR.mkdir(exist_ok=True)
+    streamlit_app.csv_path = cleaned_csv
+
+    results = {}
+    def bench(name, func, setup=None):
+        results[name] = measure(func, setup, repeat)
+        print(f"  {name:<32}{results[name]['median_s']:>10.3f}s{results[name]['peak_mb']:>10.1f} MB")
+
+    print(f"{stations}x ({rows} rows, {stations} station{'s' if stations > 1 else ''})")
+    bench("clean_weather_data", lambda: clean_data.clean_weather_data(raw_csv, cleaned_csv))
+    bench("train_model", train_model.train_model)
+    bench("generate_plots.main", generate_plots.main)
+    bench("load_data", lambda: climate.load_data(cleaned_csv))
+    bench("load_snapshot", lambda: streamlit_app.load_snapshot(None))
+
+    df = climate.load_data(cleaned_csv)
+    bench("anomaly_engine", lambda: [AnomalyEngine(df).zscores(b) for b in BASELINES])
+    engine = AnomalyEngine(df)
+    bench("yearly_stats_table", lambda: climate.yearly_stats_table(df, engine=engine))
+    bench("projection_insights", lambda: climate.projection_insights(df, engine))
+    bench("detect_events", lambda: detect_events(df))
+    bench("DateRangeStats", lambda: DateRangeStats(df))
+    range_stats = DateRangeStats(df)
+    starts = df['time'].sample(RANGE_QUERIES, replace=True, random_state=0).to_numpy()
+    ends = starts + np.timedelta64(365, 'D')
+    bench(f"range_queries_{RANGE_QUERIES}", lambda: range_stats.query_many(starts, ends))
+
+    for plot in [streamlit_app.plot_trends, streamlit_app.plot_extremes,
+                 streamlit_app.plot_monthly_heatmap]:
+        bench(plot.__name__, plot, setup=lambda: (df.copy(),))
+    bench("plot_anomalies", lambda: streamlit_app.plot_anomalies(engine.yearly_spikes()))
+
+    yearly_stats = climate.yearly_stats_table(df, engine=engine)
+    date_index = climate.build_date_index(df)
+    bench("display_historical_insights", lambda: streamlit_app.display_historical_insights(
+        df, date_index, yearly_stats, HISTORICAL_DATE, "year"))
+
+    model = climate.load_model(model_path)
+    stats = climate.projection_insights(df, engine)
+    bench("display_future_prediction", lambda: streamlit_app.display_future_prediction(
+        model, stats, FUTURE_DATE))
+
+    events = detect_events(df)
+    bench("display_events", lambda: streamlit_app.display_events(events))
+
+    return {"rows": rows, "stations": stations, "benchmarks": results}
+
+# ------------------------
+# Baseline comparison
+# ------------------------
+def compare_metric(current, base, threshold, min_delta):
+    """Ratio of current to base, and +1/-1/0 for a significant increase/decrease/neither"""
+    ratio = current / base if base else float("inf") if current else 1.0
+    if abs(current - base) < min_delta:
+        return ratio, 0
+    return ratio, 1 if ratio > 1 + threshold else -1 if ratio < 1 - threshold else 0
+
+def compare(current, baseline, threshold, memory_threshold=DEFAULT_MEMORY_THRESHOLD):
+    """Print median-time and peak-memory ratios against the baseline; return the regressions"""
+    regressions = []
+    print(f"\n{'benchmark':<40}{'baseline':>10}{'current':>10}{'ratio':>8}"
+          f"{'base MB':>10}{'curr MB':>10}{'ratio':>8}")
+    for scale, result in current["results"].items():
+        base_result = baseline["results"].get(scale)
+        if base_result is None:
+            continue
+        for name, timing in result["benchmarks"].items():
+            base_timing = base_result["benchmarks"].get(name)
+            if base_timing is None:
+                continue
+            time_ratio, time_change = compare_metric(
+                timing["median_s"], base_timing["median_s"], threshold, MIN_DELTA_S)
+            memory_ratio, memory_change = compare_metric(
+                timing["peak_mb"], base_timing["peak_mb"], memory_threshold, MIN_DELTA_MB)
+
+            flags = []
+            if time_change > 0:
+                flags.append("❌ slower")
+                regressions.append(f"{scale}/{name} (time)")
+            elif time_change < 0:
+                flags.append("✅ faster")
+            if memory_change > 0:
+                flags.append("❌ more memory")
+                regressions.append(f"{scale}/{name} (memory)")
+            elif memory_change < 0:
+                flags.append("✅ less memory")
+            print(f"{scale + '/' + name:<40}{base_timing['median_s']:>10.3f}"
+                  f"{timing['median_s']:>10.3f}{time_ratio:>8.2f}"
+                  f"{base_timing['peak_mb']:>10.1f}{timing['peak_mb']:>10.1f}{memory_ratio:>8.2f}"
+                  f"{'  ' + ', '.join(flags) if flags else ''}")
+    return regressions
+
+# ------------------------
+# Entry point
+# ------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the weather pipeline and app hot paths")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES,
+                        help="dataset sizes as multiples of the real data (one synthetic station each)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--output", type=Path, default=None, help="where to write the results JSON")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_JSON)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown reported as a regression")
+    parser.add_argument("--memory-threshold", type=float, default=DEFAULT_MEMORY_THRESHOLD,
+                        help="relative growth in peak memory reported as a regression")
+    args = parser.parse_args()
+
+    current = {
+        "meta": {
+            "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": {},
+    }
+    for stations in args.scales:
+        with tempfile.TemporaryDirectory() as workdir:
+            current["results"][f"{stations}x"] = run_scale(stations, args.repeat, Path(workdir))
+
+    output = args.output or RESULTS_DIR / f"{datetime.datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(current, indent=2) + "\n")
+    print(f"\n✅ Results saved to {output}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(current, indent=2) + "\n")
+        print(f"✅ Baseline saved to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print("ℹ️ No baseline found, run with --save-baseline to create one.")
+        return 0
+
+    regressions = compare(current, json.loads(args.baseline.read_text()), args.threshold,
+                          args.memory_threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    print("\n✅ No regressions against the baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
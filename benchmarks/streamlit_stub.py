@@ -0,0 +1,78 @@
+# benchmarks/streamlit_stub.py
+
+import io
+import sys
+import types
+
+# ------------------------
+# Stand-ins
+# ------------------------
+class _Element:
+    """Stands in for any Streamlit element, container or widget.
+
+    It is falsy so buttons read as "not pressed" and works as a context manager
+    so ``with col1:`` blocks run as they do in the app.
+    """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __bool__(self):
+        return False
+
+    def __getattr__(self, name):
+        return _noop
+
+def _noop(*args, **kwargs):
+    return _Element()
+
+class _SessionState(dict):
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        self[name] = value
+
+def _cache(func=None, **kwargs):
+    # Supports both @st.cache_data and @st.cache_data(max_entries=1)
+    if func is None:
+        return lambda f: f
+    return func
+
+def _columns(spec, **kwargs):
+    count = spec if isinstance(spec, int) else len(spec)
+    return [_Element() for _ in range(count)]
+
+def _pyplot(fig=None, **kwargs):
+    # Rasterize like st.pyplot does, so plot timings include rendering
+    if fig is not None:
+        fig.savefig(io.BytesIO(), format="png")
+
+def _select(label, options, index=0, **kwargs):
+    return list(options)[index]
+
+# ------------------------
+# Installation
+# ------------------------
+def make_streamlit_stub():
+    st = types.ModuleType("streamlit")
+    st.session_state = _SessionState()
+    st.cache_data = _cache
+    st.cache_resource = _cache
+    st.tabs = lambda labels, **kwargs: [_Element() for _ in labels]
+    st.columns = _columns
+    st.pyplot = _pyplot
+    st.date_input = lambda label, value=None, **kwargs: value
+    st.radio = _select
+    st.selectbox = _select
+    st.__getattr__ = lambda name: _noop
+    return st
+
+def install():
+    """Replace the streamlit module so the app can be imported without a server"""
+    sys.modules["streamlit"] = make_streamlit_stub()
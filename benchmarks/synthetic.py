@@ -0,0 +1,70 @@
+# benchmarks/synthetic.py
+
+import numpy as np
+import pandas as pd
+
+# ------------------------
+# Configuration
+# ------------------------
+# Size of the real Meteostat export for Dhaka
+BASE_ROWS = 17117
+START_DATE = "1975-01-01"
+MISSING_RATE = 0.05
+
+# ------------------------
+# Generator
+# ------------------------
+def synthetic_raw_weather(stations=1, days=BASE_ROWS, seed=0):
+    """Meteostat-shaped daily weather for ``stations`` stations over ``days`` days.
+
+    Scaling is done by stacking stations rather than lengthening the record,
+    since daily timestamps cannot span more than a few centuries. A ``station``
+    column is only added when there is more than one station, so the 1x dataset
+    has exactly the columns of the real export.
+    """
+    rng = np.random.default_rng(seed)
+    time = pd.date_range(START_DATE, periods=days, freq="D")
+    doy = time.dayofyear.to_numpy()
+    years = (time.year - time.year[0]).to_numpy()
+    shape = (stations, days)
+
+    # Seasonal cycle peaking in May, a slow warming trend and daily noise
+    seasonal = 26 + 5 * np.sin(2 * np.pi * (doy - 30) / 365.25)
+    tavg = seasonal + 0.02 * years + rng.normal(0, 1.5, shape)
+    tavg += rng.normal(0, 0.5, (stations, 1))
+    tmin = tavg - rng.uniform(3, 6, shape)
+    tmax = tavg + rng.uniform(3, 6, shape)
+
+    # Rain mostly falls in the monsoon months
+    monsoon = ((doy >= 152) & (doy <= 273)).astype(float)
+    prcp = rng.gamma(0.6, 4 + 16 * monsoon, shape) * (rng.random(shape) < 0.25 + 0.45 * monsoon)
+    wspd = rng.gamma(2.0, 3.0, shape)
+    wdir = rng.uniform(0, 360, shape)
+    pres = 1008 - 6 * monsoon + rng.normal(0, 2, shape)
+
+    columns = {
+        "tavg": tavg, "tmin": tmin, "tmax": tmax, "prcp": prcp,
+        "wdir": wdir, "wspd": wspd, "pres": pres,
+    }
+    df = pd.DataFrame({"time": np.tile(time, stations)})
+    for name, values in columns.items():
+        values = np.round(values, 1).ravel()
+        values[rng.random(values.size) < MISSING_RATE] = np.nan
+        df[name] = values
+
+    # A handful of sensor glitches for the outlier correction to catch
+    glitches = rng.choice(len(df), size=max(1, len(df) // 2000), replace=False)
+    df.loc[glitches, "tavg"] += rng.choice([-12, 12], size=glitches.size)
+
+    for name in ["snow", "wpgt", "tsun"]:
+        df[name] = np.nan
+    df = df[["time", "tavg", "tmin", "tmax", "prcp", "snow", "wdir", "wspd", "wpgt", "pres", "tsun"]]
+
+    if stations > 1:
+        df.insert(0, "station", np.repeat(np.arange(stations), days))
+    return df
+
+def write_synthetic_raw_weather(path, stations=1, days=BASE_ROWS, seed=0):
+    df = synthetic_raw_weather(stations, days, seed)
+    df.to_csv(path, index=False, date_format="%Y-%m-%d")
+    return len(df)
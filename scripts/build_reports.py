@@ -0,0 +1,398 @@
+# scripts/build_reports.py
+
+import argparse
+import base64
+import hashlib
+import html
+import io
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.image as mpimg
+import pandas as pd
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app"))
+import climate
+from anomalies import AnomalyEngine
+from events import detect_events, yearly_event_counts
+from ranges import DateRangeStats
+from manifest import atomic_output, file_sha256
+
+# ------------------------
+# Configuration
+# ------------------------
+BASE_DIR = Path(__file__).resolve().parent.parent
+CSV_FILE = BASE_DIR / "data" / "dhaka_weather_cleaned.csv"
+REPORTS_DIR = BASE_DIR / "reports"
+INDEX_FILE = "reports_index.json"
+FIGURE_CACHE_DIR = ".figures"
+
+# Bump when the report layout changes so existing reports are rebuilt
+REPORT_VERSION = 1
+FIGURE_DPI = 100
+ALL_YEARS = "all"
+
+# ------------------------
+# Aggregates
+# ------------------------
+def build_context(csv_path, station=None):
+    df = climate.load_data(csv_path)
+    if station is not None:
+        if 'station' not in df.columns:
+            raise ValueError("The data has no 'station' column.")
+        df = df[df['station'].astype(str) == str(station)].reset_index(drop=True)
+        if df.empty:
+            raise ValueError(f"No data for station {station}.")
+    engine = AnomalyEngine(df)
+    return {
+        "df": df,
+        "engine": engine,
+        "yearly_stats": climate.yearly_stats_table(df, "year", engine),
+        "events": detect_events(df),
+        "range_stats": DateRangeStats(df),
+        "daily_normal": engine.day_of_year_climatology(),
+        "monthly_normal": df.groupby('month')['tavg'].mean(),
+    }
+
+def year_payload(ctx, year):
+    """The little a worker needs to draw one year's figures, without the full aggregates"""
+    year_df = ctx["df"].loc[ctx["df"]['year'] == year, ['time', 'month', 'tavg']]
+    return {
+        "year": year,
+        "days": year_df.reset_index(drop=True),
+        "daily_normal": ctx["daily_normal"],
+        "monthly_normal": ctx["monthly_normal"],
+    }
+
+# ------------------------
+# Figures
+# ------------------------
+def figure_bytes(fig):
+    """PNG bytes of a figure; PNG is deflate-compressed and further optimized"""
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=FIGURE_DPI, bbox_inches="tight", pil_kwargs={"optimize": True})
+    return buf.getvalue()
+
+def plot_daily(payload):
+    year, year_df, clim = payload["year"], payload["days"], payload["daily_normal"]
+    # Feb 29 shares Feb 28's normal, as in the anomaly engine
+    doy = year_df['time'].dt.dayofyear
+    doy = doy - (year_df['time'].dt.is_leap_year & (doy > 59))
+    expected = clim.loc[doy]
+
+    fig = Figure(figsize=(10, 4))
+    ax = fig.subplots()
+    ax.fill_between(year_df['time'], expected['mean'] - expected['std'], expected['mean'] + expected['std'],
+                    color="#84a98c", alpha=0.3, label="Normal range (±1σ)")
+    ax.plot(year_df['time'], expected['mean'], color="#52796f", linewidth=1, label="Day-of-year normal")
+    ax.plot(year_df['time'], year_df['tavg'], color="#d62828", linewidth=1, label=f"{year}")
+    ax.set_title(f"Daily Average Temperature in {year}")
+    ax.set_ylabel("Temperature (°C)")
+    ax.legend(loc="lower center", ncol=3)
+    return fig
+
+def plot_monthly(payload):
+    year, normal = payload["year"], payload["monthly_normal"]
+    this_year = payload["days"].groupby('month')['tavg'].mean().reindex(normal.index)
+
+    fig = Figure(figsize=(10, 4))
+    ax = fig.subplots()
+    ax.bar(normal.index - 0.2, normal.values, width=0.4, color="#84a98c", label="Long-term")
+    ax.bar(this_year.index + 0.2, this_year.values, width=0.4, color="#e76f51", label=f"{year}")
+    ax.set_xticks(normal.index)
+    ax.set_title(f"Monthly Average Temperature in {year} vs Long-term")
+    ax.set_xlabel("Month")
+    ax.set_ylabel("Temperature (°C)")
+    ax.set_ylim(bottom=min(normal.min(), this_year.min()) - 3)
+    ax.legend()
+    return fig
+
+def plot_trend(ctx):
+    yearly = ctx["df"].groupby('year')['tavg'].agg(['mean', 'min', 'max'])
+    fig = Figure(figsize=(10, 4))
+    ax = fig.subplots()
+    for col, label in [("mean", "Avg"), ("max", "Max"), ("min", "Min")]:
+        ax.plot(yearly.index, yearly[col], label=label)
+    ax.set_title("Climate Trend in Dhaka")
+    ax.set_ylabel("Temperature (°C)")
+    ax.legend()
+    return fig
+
+def plot_spikes(ctx):
+    spikes = ctx["engine"].yearly_spikes("climatology", climate.Z_SCORE_THRESHOLD)
+    fig = Figure(figsize=(10, 4))
+    ax = fig.subplots()
+    ax.plot(spikes.index, spikes['hot-spike'], color="gold", label="hot-spike")
+    ax.plot(spikes.index, spikes['cold-spike'], color="blue", label="cold-spike")
+    ax.set_title("Anomaly Spikes (Z-score > ±2)")
+    ax.set_ylabel("Anomaly Days")
+    ax.legend(title="Anomaly Type", loc="upper right")
+    return fig
+
+def plot_events(ctx):
+    counts = yearly_event_counts(ctx["events"])
+    fig = Figure(figsize=(10, 4))
+    ax = fig.subplots()
+    if not counts.empty:
+        counts.plot(kind='bar', stacked=True, ax=ax, color=['orange', 'blue'])
+    ax.set_title("Heatwaves and Cold Spells per Year")
+    ax.set_ylabel("Events")
+    return fig
+
+# name: (title, plotting function); year figures draw from a year payload in a
+# worker, shared figures do not depend on the year and draw from the aggregates
+YEAR_FIGURES = {
+    "daily": ("Daily temperatures against the normal", plot_daily),
+    "monthly": ("Monthly averages against the long-term", plot_monthly),
+}
+SHARED_FIGURES = {
+    "trend": ("Long-term trend", plot_trend),
+    "spikes": ("Anomaly spikes", plot_spikes),
+    "events": ("Heatwaves and cold spells", plot_events),
+}
+
+def render_year_figures(payload):
+    """Worker task: render one year's figures to PNG bytes"""
+    return payload["year"], {name: figure_bytes(plot(payload)) for name, (_, plot) in YEAR_FIGURES.items()}
+
+# ------------------------
+# Report content
+# ------------------------
+def report_sections(ctx, year):
+    """Title, summary rows and tables for a year, or the whole record when ``year`` is ALL_YEARS"""
+    df = ctx["df"]
+    if year == ALL_YEARS:
+        events = ctx["events"]
+        first, last = df['time'].min().date(), df['time'].max().date()
+        stats = ctx["range_stats"].query(first, last)
+        summary = [
+            ("Period", f"{first} → {last}"),
+            ("Average temperature", f"{stats['mean']:.2f} °C"),
+            ("Lowest / highest daily average", f"{stats['min']:.1f} / {stats['max']:.1f} °C"),
+            ("Hot days (>30°C)", stats['hot_days']),
+            ("Heatwaves", int((events['type'] == 'heatwave').sum())),
+            ("Cold spells", int((events['type'] == 'cold spell').sum())),
+        ]
+        top_events = events.sort_values('duration', ascending=False).head(15)
+        return "Climate Report — Full Record", summary, [("Longest events", top_events)]
+
+    row = climate.yearly_insights(ctx["yearly_stats"], year)
+    summary = [
+        ("Average temperature", f"{row['yearly_avg']:.2f} °C"),
+        ("Overall average", f"{row['overall_avg']:.2f} °C"),
+        ("Difference", f"{row['diff']:+.2f} °C"),
+        ("Hot days (>30°C)", row['hot_days']),
+        ("Extreme hot days (>35°C)", row['extreme_hot_days']),
+        ("Cold days (<15°C)", row['cold_days']),
+        ("Extreme cold days (<10°C)", row['extreme_cold_days']),
+        ("Hot / cold spike days (z > ±2)", f"{row['hot_spikes']} / {row['cold_spikes']}"),
+    ]
+
+    # Monthly statistics straight from the range index
+    starts = pd.date_range(f"{year}-01-01", periods=12, freq="MS")
+    monthly = ctx["range_stats"].query_many(starts, starts + pd.offsets.MonthEnd(0))
+    monthly = monthly[monthly['days'] > 0].assign(month=lambda m: m['start'].dt.strftime("%b"))
+    monthly = monthly[['month', 'days', 'mean', 'min', 'max', 'hot_days']].round(2)
+
+    events = ctx["events"]
+    year_events = events[events['start'].dt.year == year]
+    return f"Climate Report — {year}", summary, [("Monthly statistics", monthly), ("Heatwaves and cold spells", year_events)]
+
+def table_html(frame):
+    if frame.empty:
+        return "<p><i>None</i></p>"
+    frame = frame.copy()
+    for col in frame.columns:
+        if pd.api.types.is_datetime64_any_dtype(frame[col]):
+            frame[col] = frame[col].dt.date
+    return frame.to_html(index=False, border=0, classes="data", float_format=lambda v: f"{v:.1f}")
+
+def render_html(title, subtitle, summary, tables, figures):
+    summary_rows = "".join(
+        f"<tr><th>{html.escape(label)}</th><td>{html.escape(str(value))}</td></tr>" for label, value in summary
+    )
+    figure_blocks = "".join(
+        f'<figure><img alt="{html.escape(caption)}" src="data:image/png;base64,{base64.b64encode(png).decode()}">'
+        f"<figcaption>{html.escape(caption)}</figcaption></figure>"
+        for caption, png in figures
+    )
+    table_blocks = "".join(f"<h2>{html.escape(name)}</h2>{table_html(frame)}" for name, frame in tables)
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(title)}</title>
+<style>
+    body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; max-width: 960px; margin: 2rem auto; color: #2f3e46; }}
+    h1 {{ color: #2f3e46; margin-bottom: 0; }}
+    h2 {{ color: #52796f; border-bottom: 1.5px solid #84a98c; padding-bottom: 4px; }}
+    .subtitle {{ color: #84a98c; margin-top: 4px; }}
+    table {{ border-collapse: collapse; margin-bottom: 1rem; }}
+    th, td {{ padding: 4px 12px; text-align: left; border-bottom: 1px solid #cad2c5; }}
+    figure {{ margin: 1.5rem 0; }}
+    img {{ max-width: 100%; }}
+    figcaption {{ color: #52796f; font-size: 0.9rem; }}
+</style>
+</head>
+<body>
+<h1>{html.escape(title)}</h1>
+<p class="subtitle">{html.escape(subtitle)}</p>
+<h2>Summary</h2>
+<table>{summary_rows}</table>
+{table_blocks}
+<h2>Figures</h2>
+{figure_blocks}
+</body>
+</html>
+"""
+
+def render_pdf(path, title, subtitle, summary, tables, figures):
+    with PdfPages(path) as pdf:
+        page = Figure(figsize=(8.27, 11.69))
+        page.text(0.08, 0.94, title, fontsize=20, weight="bold", color="#2f3e46")
+        page.text(0.08, 0.915, subtitle, fontsize=10, color="#52796f")
+        y = 0.87
+        for label, value in summary:
+            page.text(0.08, y, label, fontsize=11)
+            page.text(0.60, y, str(value), fontsize=11)
+            y -= 0.025
+        for name, frame in tables:
+            y -= 0.02
+            page.text(0.08, y, name, fontsize=13, weight="bold", color="#52796f")
+            y -= 0.025
+            text = frame.to_string(index=False) if not frame.empty else "None"
+            lines = text.splitlines()[:int(max(y - 0.04, 0) / 0.016)]
+            page.text(0.08, y, "\n".join(lines), fontsize=8, family="monospace", va="top")
+            y -= 0.016 * (len(lines) + 1)
+        pdf.savefig(page)
+
+        # Reuse the rendered PNG bytes rather than re-plotting
+        for caption, png in figures:
+            page = Figure(figsize=(11.69, 8.27))
+            ax = page.add_axes([0.03, 0.08, 0.94, 0.86])
+            ax.imshow(mpimg.imread(io.BytesIO(png), format="png"))
+            ax.axis("off")
+            page.text(0.5, 0.03, caption, ha="center", fontsize=11, color="#52796f")
+            pdf.savefig(page)
+
+# ------------------------
+# Batch building
+# ------------------------
+def report_fingerprint(data_hash, station, year, fmt):
+    key = f"{REPORT_VERSION}|{data_hash}|{station}|{year}|{fmt}"
+    return hashlib.sha256(key.encode()).hexdigest()
+
+def report_name(station, year, fmt):
+    prefix = f"station_{station}_" if station is not None else ""
+    return f"{prefix}climate_report_{year}.{fmt}"
+
+def load_index(output_dir):
+    index_path = output_dir / INDEX_FILE
+    return json.loads(index_path.read_text()) if index_path.exists() else {}
+
+def build_reports(years, csv_path=CSV_FILE, output_dir=REPORTS_DIR, station=None, fmt="html",
+                  workers=None, force=False):
+    """Build one report per year (or ALL_YEARS), skipping reports whose inputs are unchanged"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    data_hash = file_sha256(csv_path)
+    index = load_index(output_dir)
+    ctx = build_context(csv_path, station)
+
+    available = set(ctx["yearly_stats"].index)
+    pending = []
+    for year in years:
+        if year != ALL_YEARS and year not in available:
+            print(f"ℹ️ Skipping {year}: no data")
+            continue
+        name = report_name(station, year, fmt)
+        fingerprint = report_fingerprint(data_hash, station, year, fmt)
+        if not force and index.get(name) == fingerprint and (output_dir / name).exists():
+            print(f"ℹ️ Up to date: {name}")
+            continue
+        pending.append((year, name, fingerprint))
+    if not pending:
+        return []
+
+    # Shared figures are rendered once per report and data version and cached on disk
+    cache_dir = output_dir / FIGURE_CACHE_DIR / f"v{REPORT_VERSION}-{data_hash[:16]}-{station}"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    rendered = {}
+    for name, (_, plot) in SHARED_FIGURES.items():
+        path = cache_dir / f"{name}.png"
+        if not path.exists():
+            with atomic_output(path) as tmp_path:
+                tmp_path.write_bytes(figure_bytes(plot(ctx)))
+        rendered[(name, None)] = path.read_bytes()
+
+    # Per-year figures are rendered in parallel; workers get only that year's rows
+    payloads = [year_payload(ctx, year) for year, _, _ in pending if year != ALL_YEARS]
+    if payloads:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for year, figures in pool.map(render_year_figures, payloads):
+                rendered.update({(name, year): png for name, png in figures.items()})
+
+    built = []
+    created = datetime.now().strftime("%Y-%m-%d %H:%M")
+    for year, name, fingerprint in pending:
+        title, summary, tables = report_sections(ctx, year)
+        if station is not None:
+            title += f" (station {station})"
+        subtitle = f"Generated {created} from data {data_hash[:12]}"
+        figure_names = ([] if year == ALL_YEARS else list(YEAR_FIGURES)) + list(SHARED_FIGURES)
+        figures = [
+            ((YEAR_FIGURES | SHARED_FIGURES)[fig][0],
+             rendered[(fig, None if fig in SHARED_FIGURES else year)])
+            for fig in figure_names
+        ]
+        with atomic_output(output_dir / name) as tmp_path:
+            if fmt == "pdf":
+                render_pdf(tmp_path, title, subtitle, summary, tables, figures)
+            else:
+                tmp_path.write_text(render_html(title, subtitle, summary, tables, figures), encoding="utf-8")
+        index[name] = fingerprint
+        built.append(output_dir / name)
+        print(f"✅ Report saved to {output_dir / name}")
+
+    with atomic_output(output_dir / INDEX_FILE) as tmp_path:
+        tmp_path.write_text(json.dumps(index, indent=2, sort_keys=True) + "\n")
+    return built
+
+def parse_years(values):
+    """Accept single years, ranges like 1975-2025 and 'all'"""
+    years = []
+    for value in values:
+        if value == ALL_YEARS:
+            years.append(ALL_YEARS)
+        elif "-" in value:
+            first, last = (int(part) for part in value.split("-"))
+            years.extend(range(first, last + 1))
+        else:
+            years.append(int(value))
+    return years
+
+# ------------------------
+# Entry point
+# ------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build self-contained climate reports")
+    parser.add_argument("years", nargs="+", help="years, ranges like 1975-2025, or 'all' for the full record")
+    parser.add_argument("--format", choices=["html", "pdf"], default="html")
+    parser.add_argument("--station", default=None, help="restrict to one station of a multi-station file")
+    parser.add_argument("--csv", type=Path, default=CSV_FILE)
+    parser.add_argument("--output-dir", type=Path, default=REPORTS_DIR)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--force", action="store_true", help="rebuild reports even if unchanged")
+    args = parser.parse_args()
+    try:
+        build_reports(parse_years(args.years), args.csv, args.output_dir, args.station,
+                      args.format, args.workers, args.force)
+    except Exception as e:
+        print(f"❌ Report generation failed: {e}")
@@ -1,7 +1,11 @@
 # scripts/clean_data.py
 
+import numpy as np
 import pandas as pd
 from pathlib import Path
+from numpy.lib.stride_tricks import sliding_window_view
+
+from manifest import atomic_output, update_manifest
 
 # ------------------------
 # Configuration
@@ -11,6 +15,116 @@ DATA_DIR = BASE_DIR / "data"
 INPUT_CSV = DATA_DIR / "dhaka_weather.csv"
 OUTPUT_CSV = DATA_DIR / "dhaka_weather_cleaned.csv"
 
+# column: (physical min, physical max, max deviation from the rolling median,
+#          longest gap in days that is interpolated)
+# Precipitation is never interpolated: a missing day is not evidence of rain.
+CLEANING_RULES = {
+    "calc_tavg": (0, 45, 5, 7),
+    "tavg": (0, 45, 5, 7),
+    "tmin": (-5, 40, 6, 7),
+    "tmax": (5, 50, 6, 7),
+    "prcp": (0, 300, np.inf, 0),
+    "wspd": (0, 100, np.inf, 3),
+    "pres": (950, 1050, 10, 3),
+}
+OUTLIER_WINDOW = 7
+# Fewest valid days in the outlier window for its median to be used
+MIN_MEDIAN_DAYS = OUTLIER_WINDOW // 2 + 1
+MEDIAN_CHUNK_ROWS = 1 << 16
+
+# Quality flag bits, stored per cleaned column as '<column>_flag'
+FLAG_FILLED = 1
+FLAG_OUT_OF_RANGE = 2
+FLAG_OUTLIER = 4
+FLAG_MISSING = 8  # missing and left unfilled
+
+# ------------------------
+# Cleaning engine
+# ------------------------
+def fill_gaps(block, max_gap):
+    """Linearly interpolate interior gaps of at most ``max_gap`` rows down every column at once.
+
+    Longer gaps and gaps before the first or after the last valid reading stay NaN.
+    """
+    n = len(block)
+    rows = np.arange(n)[:, None]
+    cols = np.arange(block.shape[1])
+    valid = ~np.isnan(block)
+
+    # Index of the nearest valid row at or before / at or after each row
+    prev_idx = np.maximum.accumulate(np.where(valid, rows, -1), axis=0)
+    next_idx = np.minimum.accumulate(np.where(valid, rows, n)[::-1], axis=0)[::-1]
+    has_prev = prev_idx >= 0
+    has_next = next_idx < n
+    prev_val = block[prev_idx.clip(0, n - 1), cols]
+    next_val = block[next_idx.clip(0, n - 1), cols]
+
+    span = next_idx - prev_idx
+    fillable = has_prev & has_next & (span - 1 <= max_gap)
+    weight = (rows - prev_idx) / np.maximum(span, 1)
+    return np.where(fillable, prev_val + weight * (next_val - prev_val), np.nan)
+
+def rolling_median(block, window=OUTLIER_WINDOW):
+    """Centered rolling median of every column over the window's valid days.
+
+    NaN where the window runs off the series or has fewer than MIN_MEDIAN_DAYS valid days.
+    """
+    half = window // 2
+    medians = np.full(block.shape, np.nan)
+    if len(block) < window:
+        return medians
+    windows = sliding_window_view(block, window, axis=0)
+    # Chunked so the median's working copy stays small on large archives
+    for start in range(0, len(windows), MEDIAN_CHUNK_ROWS):
+        # NaNs sort last, so the median of the k valid values sits at (k - 1) // 2 and k // 2
+        chunk = np.sort(windows[start:start + MEDIAN_CHUNK_ROWS], axis=-1)
+        valid = (~np.isnan(chunk)).sum(axis=-1, keepdims=True)
+        lower = np.take_along_axis(chunk, np.maximum(valid - 1, 0) // 2, axis=-1)[..., 0]
+        upper = np.take_along_axis(chunk, valid // 2, axis=-1)[..., 0]
+        median = np.where(valid[..., 0] >= MIN_MEDIAN_DAYS, (lower + upper) / 2, np.nan)
+        medians[half + start:half + start + len(chunk)] = median
+    return medians
+
+def clean_block(block, lower, upper, max_deviation, max_gap):
+    """Range-check, gap-fill and outlier-correct a 2-D block of daily series.
+
+    Returns the cleaned block and a matching block of quality flag bits.
+    """
+    missing = np.isnan(block)
+    out_of_range = (block < lower) | (block > upper)
+    block = fill_gaps(np.clip(block, lower, upper), max_gap)
+    unfilled = np.isnan(block)
+
+    median = rolling_median(block)
+    with np.errstate(invalid='ignore'):
+        outlier = np.abs(block - median) > max_deviation
+    block = np.where(outlier, median, block)
+
+    flags = (FLAG_FILLED * (missing & ~unfilled) | FLAG_MISSING * unfilled
+             | FLAG_OUT_OF_RANGE * out_of_range | FLAG_OUTLIER * outlier).astype(np.uint8)
+    return block, flags
+
+def clean_columns(df, rules=CLEANING_RULES):
+    """Clean every rule column present in ``df`` in place and add '<column>_flag' columns"""
+    columns = [col for col in rules if col in df.columns]
+    lower, upper, max_deviation, max_gap = (np.array(v, dtype=float) for v in zip(*(rules[c] for c in columns)))
+    block = df[columns].to_numpy(dtype=float)
+    cleaned = np.empty_like(block)
+    flags = np.empty(block.shape, dtype=np.uint8)
+
+    # Series from different stations must not be interpolated into each other
+    if 'station' in df.columns:
+        groups = df.groupby('station', sort=False).indices.values()
+    else:
+        groups = [np.arange(len(df))]
+    for rows in groups:
+        cleaned[rows], flags[rows] = clean_block(block[rows], lower, upper, max_deviation, max_gap)
+
+    df[columns] = cleaned
+    for i, col in enumerate(columns):
+        df[f"{col}_flag"] = flags[:, i]
+    return columns
+
 # ------------------------
 # Main cleaning logic
 # ------------------------
@@ -34,24 +148,11 @@ def clean_weather_data(input_csv=INPUT_CSV, output_csv=OUTPUT_CSV):
             0.4 * df.loc[missing_mask, 'tmin'] + 0.6 * df.loc[missing_mask, 'tmax']
         )
 
-    # Interpolate any remaining missing values
-    df['calc_tavg'] = df['calc_tavg'].interpolate(limit_direction='both')
-
-    # Outlier detection and correction
-    roll_median = df['calc_tavg'].rolling(window=7, center=True).median()
-    deviation = (df['calc_tavg'] - roll_median).abs()
-    df['is_outlier'] = deviation > 5
-    df.loc[df['is_outlier'], 'calc_tavg'] = roll_median[df['is_outlier']]
-
-    # Clean up precipitation and wind speed if present
+    # Gap-filling, range checks and outlier correction for all numeric columns
     if 'prcp' in df.columns:
-        df['prcp'] = df['prcp'].replace(0.0001, 0).clip(upper=300)
-    if 'wspd' in df.columns:
-        df['wspd'] = df['wspd'].clip(upper=100)
-
-    # Sanity check
-    if df['calc_tavg'].isna().sum() > 0:
-        raise ValueError("❌ Some 'calc_tavg' values are still missing.")
+        df['prcp'] = df['prcp'].replace(0.0001, 0)
+    cleaned_columns = clean_columns(df)
+    df['is_outlier'] = (df['calc_tavg_flag'] & FLAG_OUTLIER) > 0
 
     # Enrichment
     df['year'] = df['time'].dt.year
@@ -71,11 +172,18 @@ def clean_weather_data(input_csv=INPUT_CSV, output_csv=OUTPUT_CSV):
     df['season'] = df['month'].apply(get_season)
 
     # Save cleaned data
-    output_csv.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(output_csv, index=False)
+    with atomic_output(output_csv) as tmp_csv:
+        df.to_csv(tmp_csv, index=False)
+    update_manifest("cleaned_data", output_csv, rows=len(df))
 
     print(f"✅ Cleaned data saved to {output_csv}")
     print(f"ℹ️ Outliers corrected: {df['is_outlier'].sum()}")
+    for col in cleaned_columns:
+        flags = df[f"{col}_flag"]
+        print(f"ℹ️ {col}: {(flags & FLAG_FILLED > 0).sum()} filled, "
+              f"{(flags & FLAG_MISSING > 0).sum()} left missing, "
+              f"{(flags & FLAG_OUT_OF_RANGE > 0).sum()} out of range, "
+              f"{(flags & FLAG_OUTLIER > 0).sum()} outliers")
 
 # ------------------------
 # Entry point
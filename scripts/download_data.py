@@ -5,6 +5,8 @@ from meteostat import Point, Daily
 from datetime import datetime
 import pandas as pd
 
+from manifest import atomic_output, update_manifest
+
 # ------------------------
 # Configuration
 # ------------------------
@@ -34,7 +36,9 @@ def download_weather_data(
             return
 
         df.reset_index(inplace=True)
-        df.to_csv(output_path, index=False)
+        with atomic_output(output_path) as tmp_csv:
+            df.to_csv(tmp_csv, index=False)
+        update_manifest("raw_data", output_path, rows=len(df))
         print(f"✅ Data saved to {output_path} ({len(df)} rows)")
 
     except Exception as e:
@@ -1,10 +1,14 @@
 # scripts/generate_plots.py
 
+import sys
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app"))
+from anomalies import AnomalyEngine
+
 # --------------------
 # Constants
 # --------------------
@@ -32,7 +36,6 @@ def main():
     if 'tavg' not in df.columns:
         raise ValueError("Missing 'tavg' column in dataset.")
     
-    df['tavg'] = df['tavg'].interpolate()
     df['year'] = df['time'].dt.year
     df['month'] = df['time'].dt.month
     df['day'] = df['time'].dt.day
@@ -77,11 +80,7 @@ def main():
     plt.close()
 
     # 4. Z-score Anomalies
-    df['month_avg'] = df.groupby('month')['tavg'].transform('mean')
-    df['zscore'] = (df['tavg'] - df['month_avg']) / df.groupby('month')['tavg'].transform('std')
-    df['anomaly'] = df['zscore'].apply(lambda z: 'hot-spike' if z > Z_SCORE_THRESHOLD else 'cold-spike' if z < -Z_SCORE_THRESHOLD else 'normal')
-    anomalies = df.groupby(['year', 'anomaly']).size().unstack(fill_value=0)
-    anomalies = anomalies.reindex(columns=['hot-spike', 'cold-spike'], fill_value=0)
+    anomalies = AnomalyEngine(df).yearly_spikes("climatology", Z_SCORE_THRESHOLD)
 
     anomalies[['hot-spike', 'cold-spike']].plot(figsize=(12,6))
     plt.title("Anomaly Spikes (Z-score > ±2)")
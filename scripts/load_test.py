@@ -0,0 +1,95 @@
+# scripts/load_test.py
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, timedelta
+
+import aiohttp
+import numpy as np
+
+# ------------------------
+# Configuration
+# ------------------------
+DEFAULT_URL = "http://localhost:8080"
+DEFAULT_REQUESTS = 2000
+DEFAULT_CONCURRENCY = 50
+
+HISTORY_START = date(1975, 1, 1)
+HISTORY_END = date(2025, 6, 30)
+FUTURE_END = date(2075, 12, 31)
+
+# ------------------------
+# Request mix
+# ------------------------
+def random_date(start, end):
+    return start + timedelta(days=random.randint(0, (end - start).days))
+
+def random_range(max_days=365):
+    start = random_date(HISTORY_START, HISTORY_END - timedelta(days=max_days))
+    return start, start + timedelta(days=random.randint(0, max_days))
+
+def random_request():
+    kind = random.choice(["observed", "predict", "yearly", "anomalies", "range", "batch", "range-batch"])
+    if kind == "observed":
+        return kind, "GET", f"/observed/{random_date(HISTORY_START, HISTORY_END)}", None
+    if kind == "predict":
+        start = random_date(HISTORY_END, FUTURE_END - timedelta(days=30))
+        end = start + timedelta(days=30)
+        return kind, "GET", f"/predict?start={start}&end={end}", None
+    if kind == "yearly":
+        return kind, "GET", f"/yearly/{random.randint(HISTORY_START.year, HISTORY_END.year)}", None
+    if kind == "anomalies":
+        return kind, "GET", "/anomalies", None
+    if kind == "range":
+        start, end = random_range()
+        return kind, "GET", f"/range?start={start}&end={end}", None
+    if kind == "range-batch":
+        ranges = [[str(start), str(end)] for start, end in (random_range() for _ in range(100))]
+        return kind, "POST", "/range", {"ranges": ranges}
+    dates = [str(random_date(HISTORY_START, HISTORY_END)) for _ in range(100)]
+    return kind, "POST", "/observed", {"dates": dates}
+
+# ------------------------
+# Main logic
+# ------------------------
+async def run(url, total, concurrency):
+    latencies = {}
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with aiohttp.ClientSession(base_url=url) as session:
+        async def one():
+            nonlocal errors
+            kind, method, path, body = random_request()
+            async with semaphore:
+                start = time.perf_counter()
+                async with session.request(method, path, json=body) as resp:
+                    await resp.read()
+                    if resp.status >= 500:
+                        errors += 1
+                elapsed = (time.perf_counter() - start) * 1000
+            latencies.setdefault(kind, []).append(elapsed)
+
+        wall_start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        wall = time.perf_counter() - wall_start
+
+    all_latencies = np.concatenate([np.array(v) for v in latencies.values()])
+    print(f"{'endpoint':<12}{'count':>8}{'p50 ms':>10}{'p99 ms':>10}")
+    for kind, values in sorted(latencies.items()) + [("all", all_latencies)]:
+        p50, p99 = np.percentile(values, [50, 99])
+        print(f"{kind:<12}{len(values):>8}{p50:>10.2f}{p99:>10.2f}")
+    print(f"ℹ️ {total} requests in {wall:.2f}s ({total / wall:.0f} req/s), {errors} server errors")
+
+# ------------------------
+# Entry Point
+# ------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the Dhaka weather API")
+    parser.add_argument("--url", default=DEFAULT_URL)
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.requests, args.concurrency))
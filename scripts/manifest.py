@@ -0,0 +1,66 @@
+# scripts/manifest.py
+
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+# ------------------------
+# Configuration
+# ------------------------
+BASE_DIR = Path(__file__).resolve().parent.parent
+MANIFEST_PATH = BASE_DIR / "data" / "manifest.json"
+
+# ------------------------
+# Helpers
+# ------------------------
+def file_sha256(path):
+    """Content hash of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+@contextmanager
+def atomic_output(path):
+    """Yield a temporary path that replaces ``path`` only once writing succeeds.
+
+    Readers polling the pipeline outputs never see a half-written file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+def read_manifest(manifest_path=None):
+    manifest_path = Path(manifest_path or MANIFEST_PATH)
+    if not manifest_path.exists():
+        return {}
+    return json.loads(manifest_path.read_text())
+
+def update_manifest(entry, path, manifest_path=None, **details):
+    """Record the content hash of a pipeline output under ``entry`` in the manifest"""
+    path = Path(path)
+    manifest_path = manifest_path or MANIFEST_PATH
+    manifest = read_manifest(manifest_path)
+    try:
+        relative = path.resolve().relative_to(BASE_DIR)
+    except ValueError:
+        relative = path
+    manifest[entry] = {
+        "path": relative.as_posix(),
+        "sha256": file_sha256(path),
+        "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        **details,
+    }
+    with atomic_output(manifest_path) as tmp_path:
+        tmp_path.write_text(json.dumps(manifest, indent=2) + "\n")
+    return manifest[entry]
@@ -10,6 +10,8 @@ from pathlib import Path
 from math import sqrt
 import joblib
 
+from manifest import atomic_output, file_sha256, update_manifest
+
 # ------------------------
 # Configuration
 # ------------------------
@@ -29,9 +31,8 @@ def train_model():
     df = pd.read_csv(CSV_FILE, parse_dates=["time"])
     if 'tavg' not in df.columns:
         raise ValueError("Missing 'tavg' in dataset.")
-
-    # Handle missing values
-    df['tavg'] = df['tavg'].interpolate(limit_direction='both').ffill().bfill()
+    # Days left missing by cleaning carry no target
+    df = df.dropna(subset=['tavg']).reset_index(drop=True)
 
     # Feature engineering
     df['year'] = df['time'].dt.year
@@ -79,7 +80,17 @@ def train_model():
     print(f"Test RMSE: {rmse:.2f}")
 
     # Save model
-    joblib.dump(model, MODEL_PATH)
+    with atomic_output(MODEL_PATH) as tmp_model:
+        joblib.dump(model, tmp_model)
+    model_sha = file_sha256(MODEL_PATH)
+    update_manifest(
+        "model", MODEL_PATH,
+        version=model_sha[:12],
+        trained_on=file_sha256(CSV_FILE),
+        rows=len(df),
+        test_mae=round(mae, 4),
+        test_rmse=round(rmse, 4),
+    )
     print(f"✅ Model saved to {MODEL_PATH}")
 
 # ------------------------